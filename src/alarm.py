@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import firebase_functions as FB
 from ics import Calendar, Event, DisplayAlarm
@@ -14,10 +15,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def create_alarm_file(user_id: str, alarm_offset_minutes: int) -> str:
+async def create_alarm_file(user_id: str, alarm_offset_minutes: int) -> str:
 
     try:
-        all_exams_details = FB.get_saved_exams_details(user_id)
+        all_exams_details = await FB.aget_saved_exams_details(user_id)
 
         cal = Calendar()
 
@@ -52,14 +53,11 @@ def create_alarm_file(user_id: str, alarm_offset_minutes: int) -> str:
         # Create a single ICS file with all events
         now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         filename = f"Exam_Reminder-{user_id}-{now}.ics"
-        filename_path = f"./{filename}"
 
-        with open(filename_path, "w") as f:
-            f.writelines(cal.serialize())
+        calendar_url = await FB.upload_calendar_bytes(
+            cal.serialize().encode(), filename)
 
-        calendar_url = FB.upload_calendar_to_firebase(filename_path, filename)
-
-        logger.info(f"Exam alarm information saved to: {filename}")
+        logger.info(f"Exam alarm information uploaded as: {filename}")
 
         return calendar_url
 
@@ -70,4 +68,4 @@ def create_alarm_file(user_id: str, alarm_offset_minutes: int) -> str:
 
 
 if __name__ == "__main__":
-    create_alarm_file("123456789", 60)
+    asyncio.run(create_alarm_file("123456789", 60))
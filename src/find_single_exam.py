@@ -29,7 +29,9 @@ async def get_single_exam_details(user_id: str, id: int, links: list) -> bool |
 
         found_exact_venue = False
 
-        # Delete previous data from firebase
+        # Delete previous data from firebase,
+        # after queued writes land so the loop isn't blocked on them
+        await FB.await_pending_writes(user_id)
         FB.delete_exams_details(user_id)
 
         def binary_search(venues, id):
@@ -88,6 +90,7 @@ async def get_single_exam_details(user_id: str, id: int, links: list) -> bool |
                                                                 'Exams_Status': exams_status, 'Exams_Date': exam_date, 'Exams_Time': exam_time,
                                                                 'Exact_Venue': None, 'All_Exams_Venues': all_venues,  'Link': link, }
 
+            await FB.await_pending_writes(user_id)
             if exact_venues_details and response.status == 200:
                 for course, course_details in exact_venues_details.items():
                     FB.save_exams_details(user_id, course, course_details)
@@ -1,12 +1,23 @@
 """ firebase helper functions"""
+import asyncio
+import atexit
+import copy
+import json
 import logging
+import mimetypes
 import re
 import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
 from typing import Optional
 
+import dotenv
 import firebase_admin
+from cachetools import TTLCache
 from firebase_admin import credentials
-from firebase_admin import firestore, storage
+from firebase_admin import firestore, firestore_async, storage
 
 # log config
 logging.basicConfig(
@@ -16,91 +27,406 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-try:
-    # Read service account credentials securely using a context manager
-    cred = credentials.Certificate("./serviceAccount.json")
+dotenv.load_dotenv()
 
-    # Initialize Firebase app
-    firebase_admin.initialize_app(
-        cred, {"storageBucket": "ug-exams-bot.appspot.com"})
+try:
+    # Prefer the service account JSON string from the environment,
+    # fall back to the local serviceAccount.json file
+    creds_json = os.environ.get("FIREBASE_SERVICE_ACCOUNT")
+    if creds_json:
+        # strict=False accepts the real newlines a double-quoted
+        # dotenv value turns the private key's \n escapes into
+        cred = credentials.Certificate(json.loads(creds_json, strict=False))
+    else:
+        cred = credentials.Certificate("./serviceAccount.json")
+
+    # Initialize Firebase app once, even if this module is imported again
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(
+            cred, {"storageBucket": "ug-exams-bot.appspot.com"})
 
     db = firestore.client()
+    async_db = firestore_async.client()
+    _BUCKET = storage.bucket()
 
 except FileNotFoundError as e:
-    logger.error(f"🔥Error loading service account credentials: {e}")
+    logger.error("🔥Error loading service account credentials: %s", e)
     raise
 
 except Exception as e:
-    logger.exception(f"🔥Unexpected error initializing Firebase app: {e}")
+    logger.exception("🔥Unexpected error initializing Firebase app: %s", e)
     raise
 
+# user documents keyed by user id, so back to back getters share one read
+_DOC_CACHE = TTLCache(maxsize=4096, ttl=30)
+
+# single field reads, one {(sanitized course, field): value} dict per user
+_FIELD_CACHE = TTLCache(maxsize=4096, ttl=60)
+
+# bumped by invalidate(), a read only fills the cache
+# if no write landed while it was fetching.
+# a plain dict (one int per user that wrote) so a version is never evicted
+_USER_VERSIONS = {}
+
+# caches are shared with the write pool threads
+_CACHE_LOCK = threading.Lock()
+_MISSING = object()
+
+_SANITIZE = re.compile(r'\W+')
+
+# seconds each startup warm up RPC may take before it is skipped
+_WARM_UP_TIMEOUT = 5
+
+# blocking storage uploads run here so they don't stall the event loop
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=8)
+
+# setters are submitted here so handlers don't wait on the write,
+# pending writes are flushed on shutdown
+_WRITE_POOL = ThreadPoolExecutor(max_workers=16)
+atexit.register(_WRITE_POOL.shutdown, wait=True)
+
+# queued setter writes per user, drained in order by one worker at a time
+_USER_WRITES = {}
+_WRITE_LOCK = threading.Lock()
+
+
+def _queue_write(user_id: str, func, *args) -> Future:
+    """
+    Queue a write behind the user's pending writes
+    so writes to one user document land in order
+    """
+    future = Future()
+    with _WRITE_LOCK:
+        queue = _USER_WRITES.setdefault(user_id, deque())
+        queue.append((future, func, args))
+        # the first queued write starts a drainer for this user
+        start_drainer = len(queue) == 1
+
+    if start_drainer:
+        try:
+            _WRITE_POOL.submit(_drain_writes, user_id)
+        except RuntimeError as e:
+            # pool is shut down, fail everything queued behind this drainer
+            # instead of leaving it orphaned
+            with _WRITE_LOCK:
+                orphaned = _USER_WRITES.pop(user_id, deque())
+            for pending, _, _ in orphaned:
+                if pending.set_running_or_notify_cancel():
+                    pending.set_exception(e)
+            logger.error(
+                "🔥Could not queue write for user ID %s: %s", user_id, e)
+
+    return future
+
+
+def _drain_writes(user_id: str) -> None:
+    """Run a user's queued writes one after the other"""
+    with _WRITE_LOCK:
+        queue = _USER_WRITES[user_id]
+
+    while True:
+        with _WRITE_LOCK:
+            future, func, args = queue[0]
+
+        try:
+            # skip writes the caller cancelled while they were queued
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = func(*args)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+
+        except Exception as e:
+            logger.exception(
+                "🔥Queued write for user ID %s failed: %s", user_id, e)
+
+        finally:
+            # always dequeue so one bad item can't wedge the user's queue
+            with _WRITE_LOCK:
+                queue.popleft()
+                drained = not queue
+                if drained:
+                    del _USER_WRITES[user_id]
+
+        if drained:
+            return
+
+
+def _pending_writes(user_id: str) -> list:
+    """Futures of the user's queued writes"""
+    with _WRITE_LOCK:
+        return [future for future, _, _ in _USER_WRITES.get(user_id, ())]
+
+
+def _wait_for_writes(user_id: str) -> None:
+    """Block until the user's queued writes have landed"""
+    pending = _pending_writes(user_id)
+    if pending:
+        wait(pending)
+
+
+async def await_pending_writes(user_id: str) -> None:
+    """
+    Wait for the user's queued writes without blocking the event loop,
+    await before calling save_exams_details/delete_exams_details
+    from a coroutine
+    """
+    pending = _pending_writes(str(user_id))
+    if pending:
+        await asyncio.wait([asyncio.wrap_future(future) for future in pending])
+
+
+@lru_cache(maxsize=1024)
+def _sanitize(course: str) -> str:
+    """Format course name to be used as dict key"""
+    return _SANITIZE.sub('_', course)
+
+
+def _cache_version(user_id: str) -> int:
+    """Read before fetching, passed back when caching the result"""
+    with _CACHE_LOCK:
+        return _USER_VERSIONS.get(user_id, 0)
+
+
+def _cached_doc(user_id: str) -> dict | None:
+    """Thread safe document cache lookup"""
+    with _CACHE_LOCK:
+        return _DOC_CACHE.get(user_id)
+
+
+def _cache_doc(user_id: str, user_doc: dict, version: int) -> None:
+    """Cache a fetched document unless the user was invalidated meanwhile"""
+    with _CACHE_LOCK:
+        if _USER_VERSIONS.get(user_id, 0) == version:
+            _DOC_CACHE[user_id] = user_doc
+
+
+def _cached_field(user_id: str, key: tuple):
+    """Thread safe field cache lookup, _MISSING when not cached"""
+    with _CACHE_LOCK:
+        return _FIELD_CACHE.get(user_id, {}).get(key, _MISSING)
+
+
+def _cache_field(user_id: str, key: tuple, value, version: int) -> None:
+    """Cache a fetched field unless the user was invalidated meanwhile"""
+    with _CACHE_LOCK:
+        if _USER_VERSIONS.get(user_id, 0) != version:
+            return
+        user_fields = _FIELD_CACHE.get(user_id)
+        if user_fields is None:
+            user_fields = _FIELD_CACHE[user_id] = {}
+        user_fields[key] = value
+
+
+def invalidate(user_id: str) -> None:
+    """
+    Drop cached reads for a user,
+    called after every write to the user document
+    """
+    with _CACHE_LOCK:
+        _USER_VERSIONS[user_id] = _USER_VERSIONS.get(user_id, 0) + 1
+        _DOC_CACHE.pop(user_id, None)
+        _FIELD_CACHE.pop(user_id, None)
+
+
+def _get_user_doc(user_id: str) -> dict | None:
+    """
+    Return the user document as a dict
+    served from cache when possible,
+    the dict is the cached object so treat it as read-only
+    """
+    version = _cache_version(user_id)
+    user_doc = _cached_doc(user_id)
+    if user_doc is not None:
+        return user_doc
+
+    doc = db.collection('users').document(user_id).get()
+    # to_dict() is None for a missing document
+    user_doc = doc.to_dict()
+    if user_doc:
+        _cache_doc(user_id, user_doc, version)
+    return user_doc if user_doc else None
+
+
+async def _aget_user_doc(user_id: str) -> dict | None:
+    """
+    Async version of _get_user_doc
+    sharing the same document cache
+    """
+    version = _cache_version(user_id)
+    user_doc = _cached_doc(user_id)
+    if user_doc is not None:
+        return user_doc
+
+    doc = await async_db.collection('users').document(user_id).get()
+    # to_dict() is None for a missing document
+    user_doc = doc.to_dict()
+    if user_doc:
+        _cache_doc(user_id, user_doc, version)
+    return user_doc if user_doc else None
+
+
+def _course_field(user_doc: dict | None, course: str, field: str):
+    """
+    Walk the user document dict for a single course field
+    instead of parsing a dotted field path
+    """
+    if not user_doc:
+        return None
+
+    course_info = user_doc.get(_sanitize(course))
+    if isinstance(course_info, dict):
+        return course_info.get(field)
+    else:
+        return None
+
+
+def _get_user_fields(user_id: str, field_paths: list) -> dict | None:
+    """
+    Read only the given field paths of the user document
+    instead of downloading every saved course
+    """
+    doc = db.collection('users').document(user_id).get(
+        field_paths=field_paths)
+    return doc.to_dict()
+
+
+def _get_course_field(user_id: str, course: str, field: str):
+    """
+    Get a single course field from the cached user document,
+    falling back to a projected read of just that field
+    """
+    sanitized_course = _sanitize(course)
+    key = (sanitized_course, field)
+    version = _cache_version(user_id)
+    value = _cached_field(user_id, key)
+    if value is not _MISSING:
+        # copy so callers can't modify cached lists
+        return copy.deepcopy(value)
+
+    user_doc = _cached_doc(user_id)
+    if user_doc is None:
+        user_doc = _get_user_fields(
+            user_id, [f'{sanitized_course}.{field}'])
+
+    value = _course_field(user_doc, course, field)
+    _cache_field(user_id, key, value, version)
+    return copy.deepcopy(value)
+
+
+async def _aget_course_field(user_id: str, course: str, field: str):
+    """
+    Async version of _get_course_field
+    sharing the same field and document caches
+    """
+    sanitized_course = _sanitize(course)
+    key = (sanitized_course, field)
+    version = _cache_version(user_id)
+    value = _cached_field(user_id, key)
+    if value is not _MISSING:
+        # copy so callers can't modify cached lists
+        return copy.deepcopy(value)
+
+    user_doc = _cached_doc(user_id)
+    if user_doc is None:
+        doc = await async_db.collection('users').document(user_id).get(
+            field_paths=[f'{sanitized_course}.{field}'])
+        user_doc = doc.to_dict()
+
+    value = _course_field(user_doc, course, field)
+    _cache_field(user_id, key, value, version)
+    return copy.deepcopy(value)
+
 
 def get_course_code(user_id: str, course) -> str:
 
     try:
-        sanitized_course = re.sub(r'\W+', '_', course)
-        doc_ref = db.collection('users').document(str(user_id))
-        doc = doc_ref.get()
-
-        if doc.exists:
-            course_code = doc.get(
-                f'{sanitized_course}.course_code')
-            return course_code
-        else:
-            return None
+        course_code = _get_course_field(str(user_id), course, 'course_code')
+        return course_code
 
     except Exception as e:
         logger.exception(
-            f"🔥Error retrieving course code for user ID {user_id}: {e}")
+            "🔥Error retrieving course code for user ID %s: %s", user_id, e)
         return None
 
 
-def set_course_code(user_id: str, course, course_code: str) -> None:
+async def aget_course_code(user_id: str, course) -> str:
+    """
+    Async version of get_course_code,
+    several lookups can be awaited together with asyncio.gather
+    """
+    try:
+        course_code = await _aget_course_field(
+            str(user_id), course, 'course_code')
+        return course_code
+
+    except Exception as e:
+        logger.exception(
+            "🔥Error retrieving course code for user ID %s: %s", user_id, e)
+        return None
+
+
+def set_course_code(user_id: str, course, course_code: str) -> Future:
+    """
+    Queue course code write without waiting for it,
+    wait on the returned future to read your own write
+    """
+    return _queue_write(
+        str(user_id), _set_course_code, user_id, course, course_code)
+
+
+def _set_course_code(user_id: str, course, course_code: str) -> None:
 
     try:
-        sanitized_course = re.sub(r'\W+', '_', course)
+        sanitized_course = _sanitize(course)
         db.collection('users').document(str(user_id)).update(
             {f'{sanitized_course}.course_code': course_code})
+        invalidate(str(user_id))
 
     except Exception as e:
         logger.exception(
-            f"🔥Error setting course code for user ID {user_id}: {e}")
+            "🔥Error setting course code for user ID %s: %s", user_id, e)
 
 
 def get_saved_exams_details(user_id: str) -> dict | None:
 
-    doc_ref = db.collection('users').document(user_id)
     try:
-        doc = doc_ref.get()
-        if doc.exists:
-            exams_details = doc.to_dict()
-            return exams_details
-        else:
-            return None
+        # copy so callers can't modify the cached document
+        return copy.deepcopy(_get_user_doc(user_id))
+    except Exception as e:
+        logger.error('🔥Error getting exams details: %s', e)
+        return None
+
+
+async def aget_saved_exams_details(user_id: str) -> dict | None:
+    """Async version of get_saved_exams_details"""
+    try:
+        # copy so callers can't modify the cached document
+        return copy.deepcopy(await _aget_user_doc(user_id))
     except Exception as e:
-        logger.error(f'🔥Error getting exams details: {e}')
+        logger.error('🔥Error getting exams details: %s', e)
         return None
 
 
 def save_exams_details(user_id: str, course: str, course_info: dict) -> None:
     """Save all exams details to firebase"""
     try:
-        doc_ref = db.collection('users').document(user_id)
-        doc = doc_ref.get()
-        if doc.exists:
-            sanitized_course = re.sub(r'\W+', '_', course)
-            doc_ref.update({
-                sanitized_course: course_info
-            })
-        else:
-            sanitized_course = re.sub(r'\W+', '_', course)
-            doc_ref.create(document_data={
-                sanitized_course: course_info
-            })
+        # queued setters must not land after this write
+        _wait_for_writes(str(user_id))
+
+        sanitized_course = _sanitize(course)
+        # merging only the course field creates the document if needed
+        # and replaces the whole course map in one write
+        db.collection('users').document(user_id).set({
+            sanitized_course: course_info
+        }, merge=[sanitized_course])
+        invalidate(user_id)
 
     except Exception as e:
         logger.exception(
-            f"🔥Error saving exams details for {user_id}: {e}"
+            "🔥Error saving exams details for %s: %s", user_id, e
         )
         return None
 
@@ -108,30 +434,47 @@ def save_exams_details(user_id: str, course: str, course_info: dict) -> None:
 def get_exams_venue(user_id: str) -> str:
     """Retrive all exams venue for all courses"""
     try:
-        doc_ref = db.collection('users').document(user_id)
-        doc = doc_ref.get()
-
-        if doc.exists:
-            all_exams_venue = doc.get('All_Exams_Venue')
-            return all_exams_venue
-        else:
-            return None
+        key = (None, 'All_Exams_Venue')
+        version = _cache_version(user_id)
+        all_exams_venue = _cached_field(user_id, key)
+        if all_exams_venue is not _MISSING:
+            # copy so callers can't modify the cached list
+            return copy.deepcopy(all_exams_venue)
+
+        user_doc = _cached_doc(user_id)
+        if user_doc is None:
+            user_doc = _get_user_fields(user_id, ['All_Exams_Venue'])
+
+        all_exams_venue = (user_doc or {}).get('All_Exams_Venue')
+        _cache_field(user_id, key, all_exams_venue, version)
+        return copy.deepcopy(all_exams_venue)
     except Exception as e:
         logger.exception(
-            f"🔥Error retrieving exams venue for user ID {user_id}: {e}")
+            "🔥Error retrieving exams venue for user ID %s: %s", user_id, e)
         return None
 
 
-def set_exact_venue(user_id: str, course, exact_venue: str) -> None:
+def set_exact_venue(user_id: str, course, exact_venue: str) -> Future:
+    """
+    Queue exact venue write without waiting for it,
+    wait on the returned future to read your own write
+    """
+    return _queue_write(
+        str(user_id), _set_exact_venue, user_id, course, exact_venue)
+
+
+def _set_exact_venue(user_id: str, course, exact_venue: str) -> None:
 
     try:
-        sanitized_course = re.sub(r'\W+', '_', course)
+        sanitized_course = _sanitize(course)
         db.collection('users').document(str(user_id)).update(
             {f'{sanitized_course}.Exact_Exams_Venue': exact_venue})
+        invalidate(str(user_id))
 
     except Exception as e:
         logger.exception(
-            f"🔥Error setting exact exams venue for user ID {user_id}: {e}")
+            "🔥Error setting exact exams venue for user ID %s: %s",
+            user_id, e)
 
 
 def get_exact_venue(user_id: str, course):
@@ -140,42 +483,39 @@ def get_exact_venue(user_id: str, course):
     Get exact venue value
     """
     try:
-        sanitized_course = re.sub(r'\W+', '_', course)
-        doc_ref = db.collection('users').document(user_id)
-        doc = doc_ref.get()
-
-        if doc.exists:
-            exact_exams_venue = doc.get(
-                f'{sanitized_course}.Exact_Exams_Venue')
-            return exact_exams_venue
-        else:
-            return None
+        exact_exams_venue = _get_course_field(
+            user_id, course, 'Exact_Exams_Venue')
+        return exact_exams_venue
     except KeyError as e:
         logger.exception(
-            f"🔥Error getting exact exams venue for user ID {user_id}: {e}")
+            "🔥Error getting exact exams venue for user ID %s: %s",
+            user_id, e)
         return None
 
 
-def set_no_id_venues(user_id: str, course: str, no_id_venue: list):
+def set_no_id_venues(user_id: str, course: str, no_id_venue: list) -> Future:
     """
-    Save venues without ID attached
+    Save venues without ID attached,
+    the write is queued without waiting for it
     """
+    # snapshot, the caller may change the list before the write runs
+    venues = list(no_id_venue) if no_id_venue else no_id_venue
+    return _queue_write(
+        str(user_id), _set_no_id_venues, user_id, course, venues)
+
+
+def _set_no_id_venues(user_id: str, course: str, no_id_venue: list):
     try:
-        sanitized_course = re.sub(r'\W+', '_', course)
-        # doc_ref = db.collection('users').document(user_id)
-        # doc = doc_ref.get()
-        if len(no_id_venue) > 0:
-
-            db.collection('users').document(user_id).update({
-                f'{sanitized_course}.No_ID_Venues': no_id_venue
-            })
-        else:
-            db.collection('users').document(user_id).update({
-                f'{sanitized_course}.No_ID_Venues': None
-            })
+        sanitized_course = _sanitize(course)
+        # remove the field instead of storing None when there are no venues
+        value = no_id_venue if no_id_venue else firestore.DELETE_FIELD
+        db.collection('users').document(user_id).update({
+            f'{sanitized_course}.No_ID_Venues': value
+        })
+        invalidate(user_id)
 
     except Exception as e:
-        logger.error(f"🔥Error Set no id venue failed -{str(e)}")
+        logger.error("🔥Error Set no id venue failed -%s", e)
 
 
 def get_no_id_venues(user_id: str, course: str) -> list | None:
@@ -183,18 +523,40 @@ def get_no_id_venues(user_id: str, course: str) -> list | None:
     Retrive venues without IDs attached
     """
     try:
-        sanitized_course = re.sub(r'\W+', '_', course)
-        doc_ref = db.collection('users').document(user_id)
-        doc = doc_ref.get()
-
-        if doc.exists:
-            no_id_venue = doc.get(f'{sanitized_course}.No_ID_Venues')
-            return no_id_venue
-        else:
-            return None
+        no_id_venue = _get_course_field(user_id, course, 'No_ID_Venues')
+        return no_id_venue
 
     except Exception as e:
-        logger.error(f"🔥Error getting no_id_venues \n {e}")
+        logger.error("🔥Error getting no_id_venues \n %s", e)
+
+
+def get_course_bundle(user_id: str, course: str) -> dict:
+    """
+    Retrive course code, exact venue and venues without IDs
+    for one course in a single read
+    """
+    fields = ['course_code', 'Exact_Exams_Venue', 'No_ID_Venues']
+    try:
+        sanitized_course = _sanitize(course)
+        version = _cache_version(user_id)
+        user_doc = _cached_doc(user_id)
+        if user_doc is None:
+            user_doc = _get_user_fields(
+                user_id, [f'{sanitized_course}.{field}' for field in fields])
+
+        course_bundle = {}
+        for field in fields:
+            value = _course_field(user_doc, course, field)
+            _cache_field(
+                user_id, (sanitized_course, field), value, version)
+            course_bundle[field] = copy.deepcopy(value)
+
+        return course_bundle
+
+    except Exception as e:
+        logger.exception(
+            "🔥Error retrieving course bundle for user ID %s: %s", user_id, e)
+        return {field: None for field in fields}
 
 
 def delete_exams_details(user_id: str) -> None:
@@ -203,85 +565,171 @@ def delete_exams_details(user_id: str) -> None:
     """
 
     try:
+        # queued setters must not recreate deleted courses
+        _wait_for_writes(str(user_id))
+
         exams_details = get_saved_exams_details(user_id)
         if not exams_details:
             return None
 
-        courses = exams_details.keys()
-        for course in courses:
-            db.collection('users').document(user_id).update({
-                f"{course}": firestore.DELETE_FIELD
-            })
+        # one update deletes every course field atomically
+        db.collection('users').document(user_id).update(
+            {course: firestore.DELETE_FIELD for course in exams_details})
+        invalidate(user_id)
 
     except Exception as e:
-        logger.error(f"🔥An error occurred while deleting exams details: {e}")
+        logger.error(
+            "🔥An error occurred while deleting exams details: %s", e)
         return None
 
 
-def upload_screenshot_to_firebase(local_file_path: str, remote_file_name: str) -> str:
+def _list_first_collection() -> None:
+    """Cheapest sync RPC to open the firestore channel"""
+    next(iter(db.collections()), None)
+
+
+async def _alist_first_collection() -> None:
+    """Cheapest async RPC to open the firestore channel"""
+    async for _ in async_db.collections():
+        break
+
+
+async def warm_up_connections() -> None:
     """
-    Upload screenschot to firebase 
-    delete local copy and
-    return a public url of the screenshot
+    Open the sync and async firestore channels at startup
+    so the TLS/HTTP2 handshake is off the first request,
+    each RPC is bounded so a slow firestore can't hold up startup
     """
+    loop = asyncio.get_running_loop()
+    # warm both channels together so startup waits at most one timeout
+    results = await asyncio.gather(
+        asyncio.wait_for(
+            loop.run_in_executor(None, _list_first_collection),
+            timeout=_WARM_UP_TIMEOUT),
+        asyncio.wait_for(
+            _alist_first_collection(), timeout=_WARM_UP_TIMEOUT),
+        return_exceptions=True)
+
+    for channel, result in zip(("sync", "async"), results):
+        if isinstance(result, Exception):
+            logger.warning(
+                "🔥Firestore %s warm up failed: %r", channel, result)
+
+
+def _upload_bytes(data: bytes, remote_path: str, content_type: str) -> str:
+    """
+    Blocking upload of in-memory data to firebase storage,
+    run on the upload pool
+    """
+    # Upload to firebase storage
+    bucket = _BUCKET
+    blob = bucket.blob(remote_path)
+    blob.upload_from_string(data, content_type=content_type)
 
-    try:
-        # Upload to firebase storage
-        bucket = storage.bucket()
-        blob = bucket.blob(f"screenshots/{remote_file_name}")
-        blob.upload_from_filename(local_file_path)
+    # return public url, readable through the bucket-level
+    # allUsers:objectViewer IAM binding (no per-object ACL call)
+    public_url = blob.public_url
+
+    return public_url
+
+
+def _upload_file(local_file_path: str, remote_path: str, content_type: Optional[str] = None) -> str:
+    """
+    Blocking upload of a local file to firebase storage,
+    run on the upload pool
+    """
+    # Upload to firebase storage, without a content type
+    # it is guessed from the file name
+    bucket = _BUCKET
+    blob = bucket.blob(remote_path)
+    blob.upload_from_filename(local_file_path, content_type=content_type)
 
-        # return public url
-        blob.make_public()
-        public_url = blob.public_url
+    # return public url, readable through the bucket-level
+    # allUsers:objectViewer IAM binding (no per-object ACL call)
+    public_url = blob.public_url
 
-        # delete local copy
-        os.remove(local_file_path)
+    # delete local copy
+    os.remove(local_file_path)
 
+    return public_url
+
+
+async def upload_bytes_to_firebase_storage(data: bytes, remote_file_name: str, folder: str, content_type: Optional[str] = None) -> str:
+    """
+    Upload in-memory data to a firebase storage folder
+    and return a public url of the file,
+    content type defaults to a guess from the file name
+    """
+
+    try:
+        if content_type is None:
+            content_type = mimetypes.guess_type(remote_file_name)[0]
+
+        loop = asyncio.get_running_loop()
+        public_url = await loop.run_in_executor(
+            _UPLOAD_POOL, _upload_bytes,
+            data, f"{folder}/{remote_file_name}", content_type)
         return public_url
 
     except Exception as e:
-        logger.exception(f'🔥Upload screenshot failed : {str(e)} ')
+        logger.exception('🔥Upload to %s failed : %s', folder, e)
 
 
-def upload_calendar_to_firebase(local_file_path: str, remote_file_name: str) -> str:
+async def upload_to_firebase_storage(local_file_path: str, remote_file_name: str, folder: str, content_type: Optional[str] = None) -> str:
     """
-    Upload calender.ics file to firebase 
+    Upload a local file to a firebase storage folder
     delete local copy and
-    return a public url of the screenshot
+    return a public url of the file,
+    content type defaults to a guess from the file name
     """
 
     try:
-        # Upload to firebase storage
-        bucket = storage.bucket()
-        blob = bucket.blob(f"calendars/{remote_file_name}")
-        blob.upload_from_filename(local_file_path)
+        loop = asyncio.get_running_loop()
+        public_url = await loop.run_in_executor(
+            _UPLOAD_POOL, _upload_file,
+            local_file_path, f"{folder}/{remote_file_name}", content_type)
+        return public_url
 
-        # return public url
-        blob.make_public()
-        public_url = blob.public_url
+    except Exception as e:
+        logger.exception('🔥Upload to %s failed : %s', folder, e)
 
-        # delete local copy
-        os.remove(local_file_path)
 
-        return public_url
+async def upload_screenshot_bytes(data: bytes, remote_file_name: str) -> str:
+    """Upload screenshot bytes to firebase"""
+    return await upload_bytes_to_firebase_storage(
+        data, remote_file_name, "screenshots", "image/png")
 
-    except Exception as e:
-        logger.exception(f'🔥Upload calendar failed : {str(e)}')
+
+async def upload_screenshot_to_firebase(local_file_path: str, remote_file_name: str) -> str:
+    """Upload screenshot file to firebase"""
+    return await upload_to_firebase_storage(
+        local_file_path, remote_file_name, "screenshots")
+
+
+async def upload_calendar_bytes(data: bytes, remote_file_name: str) -> str:
+    """Upload calender.ics contents to firebase"""
+    return await upload_bytes_to_firebase_storage(
+        data, remote_file_name, "calendars", "text/calendar")
+
+
+async def upload_calendar_to_firebase(local_file_path: str, remote_file_name: str) -> str:
+    """Upload calender.ics file to firebase"""
+    return await upload_to_firebase_storage(
+        local_file_path, remote_file_name, "calendars")
 
 
-def delete_from_firebase_storage(remote_file_name: str):
+def delete_from_firebase_storage(remote_file_name: str, folder: str = "screenshots"):
     """
-    Delete screenshot from firebase
+    Delete file (screenshot by default) from firebase
     """
 
     try:
-        bucket = storage.bucket()
-        blob = bucket.blob(f"screenshots/{remote_file_name}")
+        bucket = _BUCKET
+        blob = bucket.blob(f"{folder}/{remote_file_name}")
         blob.delete()
 
     except Exception as e:
-        logger.error(f"🔥Error deleting screenshot - {str(e)}")
+        logger.error("🔥Error deleting %s file - %s", folder, e)
 
 
 if __name__ == "__main__":
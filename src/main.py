@@ -136,7 +136,7 @@ async def handle_exam_schedules_search(message: types.Message):
 
         if links:
             found_exact_venue = await get_single_exam_details(user_id, ID, links)
-            exams_details = FB.get_saved_exams_details(user_id)
+            exams_details = await FB.aget_saved_exams_details(user_id)
         else:
             await bot.delete_messages(
                 user_id, [sticker_message_id, searching_course_msg_id])
@@ -285,6 +285,9 @@ Separate with a comma, like: ugrc210, 10921287.
 
 
 async def on_startup(bot: Bot) -> None:
+    # Open firestore connections before the first update arrives
+    await FB.warm_up_connections()
+
     try:
         # Delete and set webhook
         await bot.delete_webhook(drop_pending_updates=False)